@@ -5,13 +5,37 @@ from __future__ import annotations
 
 import argparse
 import csv
+import io
 import json
+import mmap
+import os
 import re
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dump_json(path: Path, payload: Any) -> None:
+    """Serialize with orjson when available; stdlib json otherwise."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
 SUPPORTED_RULE_TYPES = {"required", "allowed_values", "range", "regex", "equals_column"}
+
+# Row counts below the threshold are evaluated in-process; above it, rule
+# evaluation fans out over row chunks in a process pool.
+PARALLEL_ROW_THRESHOLD = 50_000
+PARALLEL_CHUNK_ROWS = 25_000
 VIOLATION_FIELDS = [
     "row_number",
     "record_key",
@@ -23,6 +47,43 @@ VIOLATION_FIELDS = [
 ]
 
 
+class _MmapReader(io.RawIOBase):
+    """Minimal raw stream over an mmap so TextIOWrapper can decode from it."""
+
+    def __init__(self, mm: mmap.mmap) -> None:
+        self._mm = mm
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._mm.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        return n
+
+    def close(self) -> None:
+        self._mm.close()
+        super().close()
+
+
+def open_csv_text(path: Path):
+    """Open a CSV for reading through a memory-mapped text stream.
+
+    The OS page cache handles prefetch and Python skips one userland buffer
+    copy per read, which matters on multi-gigabyte extracts. Empty files
+    cannot be mapped and fall back to a regular buffered open.
+    """
+    fh = path.open("rb")
+    try:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        fh.close()
+        return path.open("r", newline="", encoding="utf-8")
+    fh.close()
+    return io.TextIOWrapper(io.BufferedReader(_MmapReader(mm)), encoding="utf-8", newline="")
+
+
 def normalize(value: Any) -> str:
     if value is None:
         return ""
@@ -52,47 +113,101 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def read_rows(path: Path) -> tuple[list[str], list[dict[str, str]]]:
-    with path.open("r", newline="", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        headers = reader.fieldnames or []
-        rows = list(reader)
-    return headers, rows
+def read_columns(
+    path: Path,
+    wanted_columns: set[str],
+) -> tuple[list[str], int, dict[str, list[str]]]:
+    """Read a CSV straight into normalized column lists (struct-of-arrays).
+
+    Only columns the rules actually reference are kept, and no per-row dict is
+    ever built; each rule later scans one contiguous list.
+    """
+    with open_csv_text(path) as fh:
+        reader = csv.reader(fh)
+        headers = next(reader, None) or []
+
+        # Last occurrence wins for duplicate headers, matching DictReader.
+        index_by_header = {h: i for i, h in enumerate(headers)}
+        wanted = [(i, h) for h, i in index_by_header.items() if h in wanted_columns]
+        columns: dict[str, list[str]] = {h: [] for _, h in wanted}
+        appends = [(i, columns[h].append) for i, h in wanted]
+
+        row_count = 0
+        for row in reader:
+            if not row:
+                continue
+            row_count += 1
+            width = len(row)
+            for i, append in appends:
+                append(row[i].strip() if i < width else "")
+
+    return headers, row_count, columns
 
 
 def load_rules(path: Path) -> dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def row_matches_when(rule: dict[str, Any], row: dict[str, str]) -> bool:
+def prepare_when(rule: dict[str, Any]) -> None:
+    """Preprocess a rule's `when` clause once into rule['_when'].
+
+    The stored form is (column, op, target, case_sensitive) with the target
+    already normalized and case-folded, or None when the clause is absent or
+    malformed (in which case the rule applies to every row).
+    """
+    rule["_when"] = None
     when = rule.get("when")
     if not isinstance(when, dict):
-        return True
+        return
 
     column = normalize(when.get("column"))
     if not column:
-        return True
+        return
 
-    raw_value = normalize(row.get(column))
-    value = raw_value if when.get("case_sensitive") else raw_value.lower()
+    case_sensitive = bool(when.get("case_sensitive"))
 
     if "equals" in when:
-        target_raw = normalize(when.get("equals"))
-        target = target_raw if when.get("case_sensitive") else target_raw.lower()
-        return value == target
+        target = normalize(when.get("equals"))
+        rule["_when"] = (column, "equals", target if case_sensitive else target.lower(), case_sensitive)
+        return
 
     if "not_equals" in when:
-        target_raw = normalize(when.get("not_equals"))
-        target = target_raw if when.get("case_sensitive") else target_raw.lower()
-        return value != target
+        target = normalize(when.get("not_equals"))
+        rule["_when"] = (column, "not_equals", target if case_sensitive else target.lower(), case_sensitive)
+        return
 
     if "in" in when and isinstance(when.get("in"), list):
-        candidates = [normalize(item) for item in when.get("in", [])]
-        if not when.get("case_sensitive"):
-            candidates = [item.lower() for item in candidates]
-        return value in set(candidates)
+        candidates = frozenset(normalize(item) for item in when.get("in", []))
+        if not case_sensitive:
+            candidates = frozenset(item.lower() for item in candidates)
+        rule["_when"] = (column, "in", candidates, case_sensitive)
+
+
+def build_when_mask(rule: dict[str, Any], columns: dict[str, list[str]]) -> list[bool] | None:
+    """Evaluate a precompiled `when` clause as one pass over the gating column.
+
+    Returns None when the rule applies to every row.
+    """
+    when = rule.get("_when")
+    if when is None:
+        return None
+
+    column, op, target, case_sensitive = when
+    if column not in columns:
+        return None
 
-    return True
+    values = columns[column]
+    if not case_sensitive:
+        # Gating columns like status repeat a handful of values; memoize the
+        # case fold per distinct value instead of lowering every cell.
+        lowered: dict[str, str] = {}
+        values = [lowered.get(value) or lowered.setdefault(value, value.lower()) for value in values]
+
+    if op == "equals":
+        return [value == target for value in values]
+    if op == "not_equals":
+        return [value != target for value in values]
+    return [value in target for value in values]
 
 
 def prepare_rules(config_rules: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -124,13 +239,27 @@ def prepare_rules(config_rules: list[dict[str, Any]]) -> list[dict[str, Any]]:
             else:
                 rule["_allowed_values"] = {normalize(v).lower() for v in values}
 
+        if rule_type == "range":
+            try:
+                rule["_min"] = float(rule["min"]) if "min" in rule else None
+                rule["_max"] = float(rule["max"]) if "max" in rule else None
+            except (TypeError, ValueError) as exc:
+                raise ValueError(f"Rule '{rule_name}' has non-numeric min/max bounds") from exc
+
         if rule_type == "regex":
             pattern = normalize(rule.get("pattern"))
             if not pattern:
                 raise ValueError(f"Rule '{rule_name}' requires 'pattern'")
             flags = 0 if rule.get("case_sensitive") else re.IGNORECASE
             rule["_compiled_pattern"] = re.compile(pattern, flags)
+            # Bind the method once so the hot loop skips a dict lookup and a
+            # bound-method construction per value.
+            rule["_fullmatch"] = rule["_compiled_pattern"].fullmatch
 
+        if rule_type == "equals_column":
+            rule["_other_column"] = normalize(rule.get("other_column"))
+
+        prepare_when(rule)
         prepared.append(rule)
 
     return prepared
@@ -152,66 +281,221 @@ def collect_referenced_columns(required_columns: list[str], rules: list[dict[str
     return columns
 
 
-def evaluate_rule(rule: dict[str, Any], row: dict[str, str]) -> str | None:
-    if not row_matches_when(rule, row):
-        return None
-
-    column = rule["column"]
-    value = normalize(row.get(column))
+def parse_float_column(values: list[str]) -> list[float | None]:
+    """Parse a string column to floats once; None marks empty or non-numeric cells."""
+    parsed: list[float | None] = [None] * len(values)
+    for i, value in enumerate(values):
+        if value:
+            try:
+                parsed[i] = float(value)
+            except ValueError:
+                pass
+    return parsed
+
+
+def evaluate_rule(
+    rule: dict[str, Any],
+    columns: dict[str, list[str]],
+    mask: list[bool] | None,
+    float_cache: dict[str, list[float | None]] | None = None,
+) -> list[tuple[int, str]]:
+    """Evaluate one rule over its whole column, returning (row_index, message) hits."""
+    values = columns[rule["column"]]
     rule_type = rule["type"]
+    hits: list[tuple[int, str]] = []
+    record = hits.append
 
     if rule_type == "required":
-        if not value:
-            return "value is required"
-        return None
+        for i, value in enumerate(values):
+            if mask is not None and not mask[i]:
+                continue
+            if not value:
+                record((i, "value is required"))
+        return hits
 
     if rule_type == "allowed_values":
-        if not value:
-            return None
-        candidate = value if rule.get("case_sensitive") else value.lower()
-        if candidate not in rule["_allowed_values"]:
-            return f"value '{value}' is not in allowed set"
-        return None
+        allowed = rule["_allowed_values"]
+        case_sensitive = bool(rule.get("case_sensitive"))
+        # Columns under allowed-value rules (status, grade, department) are
+        # low-cardinality, so cache the case fold per distinct value.
+        lowered: dict[str, str] = {}
+        for i, value in enumerate(values):
+            if mask is not None and not mask[i]:
+                continue
+            if not value:
+                continue
+            if case_sensitive:
+                candidate = value
+            else:
+                candidate = lowered.get(value)
+                if candidate is None:
+                    candidate = value.lower()
+                    lowered[value] = candidate
+            if candidate not in allowed:
+                record((i, f"value '{value}' is not in allowed set"))
+        return hits
 
     if rule_type == "range":
-        if not value:
-            return None
-        try:
-            number = float(value)
-        except ValueError:
-            return f"value '{value}' is not numeric"
-
-        if "min" in rule and number < float(rule["min"]):
-            return f"value {number:g} is below min {float(rule['min']):g}"
-        if "max" in rule and number > float(rule["max"]):
-            return f"value {number:g} is above max {float(rule['max']):g}"
-        return None
+        minimum = rule["_min"]
+        maximum = rule["_max"]
+        has_min = minimum is not None
+        has_max = maximum is not None
+        # Parse the column once and share the floats between every range rule
+        # targeting it; the hot loop is then pure comparisons, no try/except.
+        column = rule["column"]
+        parsed = float_cache.get(column) if float_cache is not None else None
+        if parsed is None:
+            parsed = parse_float_column(values)
+            if float_cache is not None:
+                float_cache[column] = parsed
+        for i, number in enumerate(parsed):
+            if mask is not None and not mask[i]:
+                continue
+            if number is None:
+                value = values[i]
+                if value:
+                    record((i, f"value '{value}' is not numeric"))
+            elif has_min and number < minimum:
+                record((i, f"value {number:g} is below min {minimum:g}"))
+            elif has_max and number > maximum:
+                record((i, f"value {number:g} is above max {maximum:g}"))
+        return hits
 
     if rule_type == "regex":
-        if not value:
-            return None
-        if not rule["_compiled_pattern"].fullmatch(value):
-            return f"value '{value}' does not match required pattern"
-        return None
+        fullmatch = rule["_fullmatch"]
+        for i, value in enumerate(values):
+            if mask is not None and not mask[i]:
+                continue
+            if not value:
+                continue
+            if not fullmatch(value):
+                record((i, f"value '{value}' does not match required pattern"))
+        return hits
 
     if rule_type == "equals_column":
-        other_column = normalize(rule.get("other_column"))
+        other_column = rule["_other_column"]
         if not other_column:
-            return "rule misconfigured: other_column is required"
-        other_value = normalize(row.get(other_column))
-        if value != other_value:
-            return f"value '{value}' does not match {other_column} '{other_value}'"
-        return None
-
-    return f"unsupported rule type '{rule_type}'"
-
-
-def write_violations(path: Path, violations: list[dict[str, str]]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="", encoding="utf-8") as fh:
-        writer = csv.DictWriter(fh, fieldnames=VIOLATION_FIELDS)
-        writer.writeheader()
-        writer.writerows(violations)
+            message = "rule misconfigured: other_column is required"
+            for i in range(len(values)):
+                if mask is not None and not mask[i]:
+                    continue
+                record((i, message))
+            return hits
+        other_values = columns[other_column]
+        for i, value in enumerate(values):
+            if mask is not None and not mask[i]:
+                continue
+            other_value = other_values[i]
+            if value != other_value:
+                record((i, f"value '{value}' does not match {other_column} '{other_value}'"))
+        return hits
+
+    message = f"unsupported rule type '{rule_type}'"
+    for i in range(len(values)):
+        if mask is not None and not mask[i]:
+            continue
+        record((i, message))
+    return hits
+
+
+# Patterns with backreferences, named groups or conditional group references
+# cannot be concatenated safely: group numbers shift, duplicate group names
+# fail to compile, and conditionals silently rebind. Such rules keep their
+# individual passes.
+_BACKREF_PATTERN = re.compile(r"\\\d|\(\?P[=<]|\(\?\(")
+
+
+def combine_regex_rules(
+    prepared_rules: list[dict[str, Any]],
+) -> list[tuple[str, list[int], re.Pattern[str]]]:
+    """Batch regex rules sharing a column, flags and when clause.
+
+    Each batch gets one combined pattern of lookaheads that succeeds only when
+    every member rule would fullmatch, so clean values — the common case — pay
+    a single regex engine call instead of one per rule. Values that fail the
+    combined pattern fall back to per-rule matching to attribute the violation.
+    """
+    groups: dict[tuple[Any, ...], list[int]] = {}
+    for position, rule in enumerate(prepared_rules):
+        if rule["type"] != "regex":
+            continue
+        pattern = rule["_compiled_pattern"]
+        if _BACKREF_PATTERN.search(pattern.pattern):
+            continue
+        key = (rule["column"], pattern.flags, rule["_when"])
+        groups.setdefault(key, []).append(position)
+
+    combined: list[tuple[str, list[int], re.Pattern[str]]] = []
+    for (column, flags, _), positions in groups.items():
+        if len(positions) < 2:
+            continue
+        try:
+            all_pass = re.compile(
+                "".join(
+                    f"(?=(?:{prepared_rules[p]['_compiled_pattern'].pattern})\\Z)" for p in positions
+                ),
+                flags,
+            )
+        except re.error:
+            # Concatenation can still fail for constructs the exclusion filter
+            # misses; those rules simply keep their individual passes.
+            continue
+        combined.append((column, positions, all_pass))
+    return combined
+
+
+def evaluate_rules(
+    prepared_rules: list[dict[str, Any]],
+    columns: dict[str, list[str]],
+    offset: int = 0,
+) -> list[tuple[int, int, str]]:
+    """Run every rule over a (possibly chunked) column block.
+
+    Returns (row_index, rule_position, message) hits; `offset` maps chunk-local
+    indices back to positions in the full file so chunks can run in parallel.
+    """
+    hits: list[tuple[int, int, str]] = []
+    float_cache: dict[str, list[float | None]] = {}
+
+    # Rules sharing a `when` predicate (e.g. several gated on status ==
+    # 'active') share one mask pass instead of re-scanning the gating column.
+    mask_cache: dict[tuple[Any, ...], list[bool] | None] = {}
+
+    def mask_for(rule: dict[str, Any]) -> list[bool] | None:
+        key = rule["_when"]
+        if key is None:
+            return None
+        if key not in mask_cache:
+            mask_cache[key] = build_when_mask(rule, columns)
+        return mask_cache[key]
+
+    combined_groups = combine_regex_rules(prepared_rules)
+    batched_positions = {position for _, positions, _ in combined_groups for position in positions}
+
+    for rule_position, rule in enumerate(prepared_rules):
+        if rule_position in batched_positions:
+            continue
+        mask = mask_for(rule)
+        for row_index, message in evaluate_rule(rule, columns, mask, float_cache):
+            hits.append((row_index + offset, rule_position, message))
+
+    for column, positions, all_pass in combined_groups:
+        mask = mask_for(prepared_rules[positions[0]])
+        members = [(position, prepared_rules[position]["_fullmatch"]) for position in positions]
+        match_all = all_pass.match
+        for i, value in enumerate(columns[column]):
+            if mask is not None and not mask[i]:
+                continue
+            if not value:
+                continue
+            if match_all(value):
+                continue
+            for position, fullmatch in members:
+                if not fullmatch(value):
+                    hits.append(
+                        (i + offset, position, f"value '{value}' does not match required pattern")
+                    )
+    return hits
 
 
 def main() -> int:
@@ -238,55 +522,78 @@ def main() -> int:
     required_columns = [normalize(col) for col in rules_config.get("required_columns", []) if normalize(col)]
     prepared_rules = prepare_rules(raw_rules)
 
-    headers, rows = read_rows(input_path)
-    header_set = set(headers)
-
     key_column = normalize(args.key_column) or normalize(rules_config.get("key_column")) or "student_id"
 
     referenced_columns = collect_referenced_columns(required_columns, prepared_rules)
+    headers, row_total, columns = read_columns(input_path, referenced_columns | {key_column})
+    header_set = set(headers)
+
     missing_columns = sorted(col for col in referenced_columns if col not in header_set)
 
-    violations: list[dict[str, str]] = []
+    violation_count = 0
     violations_by_rule: Counter[str] = Counter()
 
-    if not missing_columns:
-        for row_number, row in enumerate(rows, start=2):
-            record_key = normalize(row.get(key_column))
-            for rule in prepared_rules:
-                message = evaluate_rule(rule, row)
-                if not message:
-                    continue
-
+    # Stream violations straight to the open writer so a dirty file never
+    # balloons memory; only the counter and per-rule totals stay in RAM.
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", newline="", encoding="utf-8") as out_fh:
+        writer = csv.writer(out_fh)
+        writer.writerow(VIOLATION_FIELDS)
+
+        def emit(part: list[tuple[int, int, str]]) -> None:
+            nonlocal violation_count
+            part.sort(key=lambda item: (item[0], item[1]))
+            for row_index, rule_position, message in part:
+                rule = prepared_rules[rule_position]
                 rule_name = rule["name"]
                 violations_by_rule[rule_name] += 1
-                violations.append(
-                    {
-                        "row_number": str(row_number),
-                        "record_key": record_key,
-                        "rule_name": rule_name,
-                        "rule_type": rule["type"],
-                        "column": rule["column"],
-                        "value": normalize(row.get(rule["column"])),
-                        "message": message,
-                    }
+                violation_count += 1
+                # Tuples in VIOLATION_FIELDS order: cheaper to build than
+                # per-row dicts and csv.writer skips DictWriter's lookups.
+                writer.writerow(
+                    (
+                        str(row_index + 2),
+                        key_values[row_index],
+                        rule_name,
+                        rule["type"],
+                        rule["column"],
+                        columns[rule["column"]][row_index],
+                        message,
+                    )
                 )
 
-    write_violations(output_path, violations)
+        if not missing_columns:
+            key_values = columns.get(key_column, [""] * row_total)
+
+            if row_total >= PARALLEL_ROW_THRESHOLD and (os.cpu_count() or 1) > 1:
+                chunks = []
+                offsets = []
+                for start in range(0, row_total, PARALLEL_CHUNK_ROWS):
+                    stop = start + PARALLEL_CHUNK_ROWS
+                    chunks.append({col: values[start:stop] for col, values in columns.items()})
+                    offsets.append(start)
+                # Chunks cover ascending row ranges and map preserves order,
+                # so emitting each sorted part keeps the global row ordering.
+                with ProcessPoolExecutor() as executor:
+                    for part in executor.map(evaluate_rules, repeat(prepared_rules), chunks, offsets):
+                        emit(part)
+            else:
+                emit(evaluate_rules(prepared_rules, columns))
 
     summary = {
         "input": str(input_path),
         "rules_file": str(rules_path),
-        "rows_scanned": len(rows),
+        "rows_scanned": row_total,
         "rule_count": len(prepared_rules),
         "key_column": key_column,
         "required_columns": required_columns,
         "missing_columns": missing_columns,
-        "violation_count": len(violations),
+        "violation_count": violation_count,
         "violations_by_rule": dict(violations_by_rule),
     }
 
     summary_path.parent.mkdir(parents=True, exist_ok=True)
-    summary_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    dump_json(summary_path, summary)
 
     if missing_columns:
         print(
@@ -297,7 +604,7 @@ def main() -> int:
         return 2
 
     print(
-        f"Rules validation complete: rows={len(rows)} violations={len(violations)} "
+        f"Rules validation complete: rows={row_total} violations={violation_count} "
         f"-> {output_path}"
     )
     print(f"Summary: {summary_path}")
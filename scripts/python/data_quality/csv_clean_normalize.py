@@ -5,9 +5,16 @@ from __future__ import annotations
 
 import argparse
 import csv
+import io
+import mmap
+import re
 from datetime import datetime
+from hashlib import blake2b
 from pathlib import Path
 
+# Runs of anything that is not an alphanumeric collapse to one underscore.
+_HEADER_SEPARATORS = re.compile(r"[\W_]+")
+
 DATE_FORMATS = (
     "%Y-%m-%d",
     "%Y/%m/%d",
@@ -17,11 +24,59 @@ DATE_FORMATS = (
 )
 
 
+class _MmapReader(io.RawIOBase):
+    """Minimal raw stream over an mmap so TextIOWrapper can decode from it."""
+
+    def __init__(self, mm: mmap.mmap) -> None:
+        self._mm = mm
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._mm.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        return n
+
+    def close(self) -> None:
+        self._mm.close()
+        super().close()
+
+
+def open_csv_text(path: Path):
+    """Open a CSV for reading through a memory-mapped text stream.
+
+    The OS page cache handles prefetch and Python skips one userland buffer
+    copy per read, which matters on multi-gigabyte extracts. Empty files
+    cannot be mapped and fall back to a regular buffered open.
+    """
+    fh = path.open("rb")
+    try:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        fh.close()
+        return path.open("r", newline="", encoding="utf-8")
+    fh.close()
+    return io.TextIOWrapper(io.BufferedReader(_MmapReader(mm)), encoding="utf-8", newline="")
+
+
 def normalize_header(name: str) -> str:
-    cleaned = "".join(ch.lower() if ch.isalnum() else "_" for ch in name.strip())
-    while "__" in cleaned:
-        cleaned = cleaned.replace("__", "_")
-    return cleaned.strip("_")
+    return _HEADER_SEPARATORS.sub("_", name.strip().lower()).strip("_")
+
+
+# (length, separator, separator position) -> the only format that can match,
+# so well-formed values pay one strptime attempt instead of averaging ~2.5.
+_DATE_FORMAT_BY_SHAPE = {
+    (10, "-", 4): "%Y-%m-%d",
+    (10, "/", 4): "%Y/%m/%d",
+    (10, "-", 2): "%d-%m-%Y",
+    (10, "/", 2): "%m/%d/%Y",
+    (19, "-", 4): "%Y-%m-%d %H:%M:%S",
+}
+
+_DATE_CACHE_LIMIT = 50_000
+_date_cache: dict[str, str] = {}
 
 
 def normalize_date(value: str) -> str:
@@ -29,12 +84,48 @@ def normalize_date(value: str) -> str:
     if not text:
         return ""
 
-    for fmt in DATE_FORMATS:
-        try:
-            return datetime.strptime(text, fmt).strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-    return text
+    cached = _date_cache.get(text)
+    if cached is not None:
+        return cached
+
+    result = None
+    length = len(text)
+    if length in (10, 19):
+        fmt = None
+        if text[2] in "-/":
+            fmt = _DATE_FORMAT_BY_SHAPE.get((length, text[2], 2))
+        elif text[4] in "-/":
+            fmt = _DATE_FORMAT_BY_SHAPE.get((length, text[4], 4))
+        if fmt:
+            try:
+                result = datetime.strptime(text, fmt).strftime("%Y-%m-%d")
+            except ValueError:
+                result = None
+
+    if result is None:
+        result = text
+        for fmt in DATE_FORMATS:
+            try:
+                result = datetime.strptime(text, fmt).strftime("%Y-%m-%d")
+                break
+            except ValueError:
+                continue
+
+    # Date columns repeat heavily, so memoize with a cap to bound memory.
+    if len(_date_cache) < _DATE_CACHE_LIMIT:
+        _date_cache[text] = result
+    return result
+
+
+def dedupe_hash(parts: list[str]) -> int:
+    """Collapse a composite dedupe key to a 64-bit int.
+
+    Storing ints instead of string tuples keeps the `seen` set an order of
+    magnitude smaller on multi-million-row extracts; at 64 bits the collision
+    odds are negligible for realistic row counts.
+    """
+    digest = blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
 
 
 def parse_args() -> argparse.Namespace:
@@ -74,56 +165,67 @@ def main() -> int:
     if not input_path.exists():
         raise FileNotFoundError(f"Input file not found: {input_path}")
 
-    with input_path.open("r", newline="", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        original_headers = reader.fieldnames or []
-        rows = list(reader)
-
-    normalized_headers = [normalize_header(h) for h in original_headers]
-    header_map = dict(zip(original_headers, normalized_headers))
-
-    date_columns = {normalize_header(col) for col in args.date_columns}
-    dedupe_keys = [normalize_header(col) for col in args.dedupe_keys]
-    if args.drop_duplicates:
-        missing_dedupe_keys = [col for col in dedupe_keys if col not in normalized_headers]
-        if missing_dedupe_keys:
-            raise ValueError(
-                "Invalid --dedupe-keys value(s): "
-                f"{', '.join(missing_dedupe_keys)}. "
-                f"Available columns: {', '.join(normalized_headers)}"
-            )
-
-    cleaned_rows = []
-    seen = set()
+    input_rows = 0
+    output_rows = 0
+    seen: set[int] = set()
     removed_duplicates = 0
 
-    for row in rows:
-        cleaned = {}
-        for old_header, new_header in header_map.items():
-            raw_value = row.get(old_header) or ""
-            value = raw_value.strip()
-            if new_header in date_columns and value:
-                value = normalize_date(value)
-            cleaned[new_header] = value
+    with open_csv_text(input_path) as fh:
+        # csv.reader with positional indexes: building (and then throwing
+        # away) a dict per row is the main parse overhead of DictReader.
+        reader = csv.reader(fh)
+        original_headers = next(reader, None) or []
+        column_count = len(original_headers)
 
-        if args.drop_duplicates:
-            dedupe_key = tuple(cleaned.get(k, "") for k in dedupe_keys)
-            if dedupe_key in seen:
-                removed_duplicates += 1
-                continue
-            seen.add(dedupe_key)
+        normalized_headers = [normalize_header(h) for h in original_headers]
 
-        cleaned_rows.append(cleaned)
+        date_columns = {normalize_header(col) for col in args.date_columns}
+        dedupe_keys = [normalize_header(col) for col in args.dedupe_keys]
+        if args.drop_duplicates:
+            missing_dedupe_keys = [col for col in dedupe_keys if col not in normalized_headers]
+            if missing_dedupe_keys:
+                raise ValueError(
+                    "Invalid --dedupe-keys value(s): "
+                    f"{', '.join(missing_dedupe_keys)}. "
+                    f"Available columns: {', '.join(normalized_headers)}"
+                )
+
+        date_indexes = {i for i, h in enumerate(normalized_headers) if h in date_columns}
+        dedupe_indexes = (
+            [normalized_headers.index(k) for k in dedupe_keys] if args.drop_duplicates else []
+        )
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as fh:
-        writer = csv.DictWriter(fh, fieldnames=normalized_headers)
-        writer.writeheader()
-        writer.writerows(cleaned_rows)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with output_path.open("w", newline="", encoding="utf-8") as out_fh:
+            writer = csv.writer(out_fh)
+            writer.writerow(normalized_headers)
+
+            # Stream rows straight through to the writer so peak memory is one
+            # row plus the dedupe key set, not the whole extract twice over.
+            for row in reader:
+                if not row:
+                    continue
+                input_rows += 1
+                if len(row) != column_count:
+                    row = row[:column_count] + [""] * (column_count - len(row))
+                cleaned = [value.strip() for value in row]
+                for i in date_indexes:
+                    if cleaned[i]:
+                        cleaned[i] = normalize_date(cleaned[i])
+
+                if args.drop_duplicates:
+                    dedupe_key = dedupe_hash([cleaned[i] for i in dedupe_indexes])
+                    if dedupe_key in seen:
+                        removed_duplicates += 1
+                        continue
+                    seen.add(dedupe_key)
+
+                output_rows += 1
+                writer.writerow(cleaned)
 
     print(
         "Clean complete: "
-        f"input_rows={len(rows)}, output_rows={len(cleaned_rows)}, "
+        f"input_rows={input_rows}, output_rows={output_rows}, "
         f"duplicates_removed={removed_duplicates} -> {output_path}"
     )
     return 0
@@ -5,10 +5,25 @@ from __future__ import annotations
 
 import argparse
 import csv
+import heapq
 import json
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dump_json(path: Path, payload: Any) -> None:
+    """Serialize with orjson when available; stdlib json otherwise."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
 NULL_VALUES = {"", "null", "none", "na", "n/a"}
 
 
@@ -18,45 +33,62 @@ def is_null(value: Any) -> bool:
     return str(value).strip().lower() in NULL_VALUES
 
 
-def to_number(value: str) -> float | None:
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return None
-
-
 def profile_csv(input_path: Path) -> dict[str, Any]:
     with input_path.open("r", newline="", encoding="utf-8") as fh:
         reader = csv.DictReader(fh)
         headers = reader.fieldnames or []
-        rows = list(reader)
+
+        # Running aggregates per column; one streaming pass over the file
+        # instead of re-materializing every column as multiple lists.
+        distinct: dict[str, set[str]] = {h: set() for h in headers}
+        null_counts: dict[str, int] = {h: 0 for h in headers}
+        numeric_ok: dict[str, bool] = {h: True for h in headers}
+        numeric_min: dict[str, float] = {}
+        numeric_max: dict[str, float] = {}
+        row_count = 0
+
+        for row in reader:
+            row_count += 1
+            for header in headers:
+                value = (row.get(header) or "").strip()
+                if value.lower() in NULL_VALUES:
+                    null_counts[header] += 1
+                    continue
+                distinct[header].add(value)
+                # Once a single non-null value fails to parse the column can
+                # never be fully numeric, so skip float() from then on.
+                if numeric_ok[header]:
+                    try:
+                        number = float(value)
+                    except ValueError:
+                        numeric_ok[header] = False
+                    else:
+                        if header not in numeric_min or number < numeric_min[header]:
+                            numeric_min[header] = number
+                        if header not in numeric_max or number > numeric_max[header]:
+                            numeric_max[header] = number
 
     profile: dict[str, Any] = {
         "file": str(input_path),
-        "row_count": len(rows),
+        "row_count": row_count,
         "column_count": len(headers),
         "columns": {},
     }
 
     for header in headers:
-        values = [(row.get(header) or "").strip() for row in rows]
-        non_null = [v for v in values if not is_null(v)]
-        null_count = len(values) - len(non_null)
-
-        numeric_values = [to_number(v) for v in non_null]
-        numeric_clean = [n for n in numeric_values if n is not None]
-        is_numeric_column = bool(non_null) and len(numeric_clean) == len(non_null)
+        null_count = null_counts[header]
+        non_null_count = row_count - null_count
 
         col_profile: dict[str, Any] = {
             "null_count": null_count,
-            "null_rate": round((null_count / len(values)), 4) if values else 0.0,
-            "distinct_count": len(set(non_null)),
-            "sample_values": sorted(set(non_null))[:5],
+            "null_rate": round((null_count / row_count), 4) if row_count else 0.0,
+            "distinct_count": len(distinct[header]),
+            "sample_values": heapq.nsmallest(5, distinct[header]),
         }
 
-        if is_numeric_column:
-            col_profile["numeric_min"] = min(numeric_clean)
-            col_profile["numeric_max"] = max(numeric_clean)
+        if non_null_count and numeric_ok[header]:
+            col_profile["numeric_min"] = numeric_min[header]
+            col_profile["numeric_max"] = numeric_max[header]
 
         profile["columns"][header] = col_profile
 
@@ -85,7 +117,7 @@ def main() -> int:
 
     result = profile_csv(input_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    dump_json(output_path, result)
 
     print(
         f"Profile complete: rows={result['row_count']}, columns={result['column_count']} -> {output_path}"
@@ -6,6 +6,20 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
+from typing import Any
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dump_json(path: Path, payload: Any) -> None:
+    """Serialize with orjson when available; stdlib json otherwise."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
 
 def parse_sheet_columns(entries: list[str]) -> dict[str, list[str]]:
@@ -74,7 +88,8 @@ def main() -> int:
     except Exception as exc:  # pragma: no cover
         raise RuntimeError("openpyxl is required for workbook validation") from exc
 
-    wb = load_workbook(workbook_path, data_only=True)
+    # read_only streams rows instead of materializing a Cell object per value.
+    wb = load_workbook(workbook_path, data_only=True, read_only=True)
 
     required_cols_map = parse_sheet_columns(args.required_columns)
     allowed_values_map = parse_allowed_values(args.allowed_values)
@@ -97,7 +112,7 @@ def main() -> int:
             continue
 
         ws = wb[sheet_name]
-        headers = [cell.value for cell in ws[1]]
+        headers = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
         headers_norm = [str(h).strip() if h is not None else "" for h in headers]
 
         for col in expected_cols:
@@ -110,26 +125,39 @@ def main() -> int:
                     }
                 )
 
+    # Group allowed-value rules by sheet so each sheet is streamed once even
+    # when several rules target different columns of the same sheet.
+    rules_by_sheet: dict[str, list[tuple[str, set[str]]]] = {}
     for (sheet_name, column_name), allowed in allowed_values_map.items():
+        rules_by_sheet.setdefault(sheet_name, []).append((column_name, allowed))
+
+    for sheet_name, column_rules in rules_by_sheet.items():
         if sheet_name not in wb.sheetnames:
             continue
         ws = wb[sheet_name]
-        headers = [str(cell.value).strip() if cell.value is not None else "" for cell in ws[1]]
-        if column_name not in headers:
+        headers = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        headers_norm = [str(h).strip() if h is not None else "" for h in headers]
+
+        checks = [
+            (headers_norm.index(column_name), column_name, allowed)
+            for column_name, allowed in column_rules
+            if column_name in headers_norm
+        ]
+        if not checks:
             continue
 
-        col_index = headers.index(column_name) + 1
-        for row_idx in range(2, ws.max_row + 1):
-            cell_val = ws.cell(row=row_idx, column=col_index).value
-            text_val = "" if cell_val is None else str(cell_val).strip()
-            if text_val and text_val not in allowed:
-                issues.append(
-                    {
-                        "type": "invalid_value",
-                        "sheet": sheet_name,
-                        "detail": f"{column_name} row {row_idx}: {text_val}",
-                    }
-                )
+        for row_idx, row_values in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+            for col_index, column_name, allowed in checks:
+                cell_val = row_values[col_index] if col_index < len(row_values) else None
+                text_val = "" if cell_val is None else str(cell_val).strip()
+                if text_val and text_val not in allowed:
+                    issues.append(
+                        {
+                            "type": "invalid_value",
+                            "sheet": sheet_name,
+                            "detail": f"{column_name} row {row_idx}: {text_val}",
+                        }
+                    )
 
     result = {
         "workbook": str(workbook_path),
@@ -139,7 +167,7 @@ def main() -> int:
     }
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    dump_json(output_path, result)
 
     print(f"Workbook validation complete: issues={len(issues)} -> {output_path}")
     return 0 if result["valid"] else 1
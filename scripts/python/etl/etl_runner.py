@@ -5,11 +5,36 @@ from __future__ import annotations
 
 import argparse
 import csv
+import io
 import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from hashlib import blake2b
+from itertools import chain, islice, repeat
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dump_json(path: Path, payload: Any) -> None:
+    """Serialize with orjson when available; stdlib json otherwise."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+# Files that fill at least one full batch fan row transforms out to a process
+# pool; smaller extracts stay serial and never pay the pool start-up cost.
+PARALLEL_BATCH_ROWS = 50_000
+PARALLEL_CHUNK_ROWS = 10_000
+
 DATE_FORMATS = (
     "%Y-%m-%d",
     "%Y/%m/%d",
@@ -18,17 +43,122 @@ DATE_FORMATS = (
     "%Y-%m-%d %H:%M:%S",
 )
 
+# (length, separator, separator position) -> the only format that can match,
+# so well-formed values pay one strptime attempt instead of averaging ~2.5.
+_DATE_FORMAT_BY_SHAPE = {
+    (10, "-", 4): "%Y-%m-%d",
+    (10, "/", 4): "%Y/%m/%d",
+    (10, "-", 2): "%d-%m-%Y",
+    (10, "/", 2): "%m/%d/%Y",
+    (19, "-", 4): "%Y-%m-%d %H:%M:%S",
+}
+
+_DATE_CACHE_LIMIT = 50_000
+_date_cache: dict[str, str] = {}
+
+
+class _MmapReader(io.RawIOBase):
+    """Minimal raw stream over an mmap so TextIOWrapper can decode from it."""
+
+    def __init__(self, mm: mmap.mmap) -> None:
+        self._mm = mm
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._mm.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        return n
+
+    def close(self) -> None:
+        self._mm.close()
+        super().close()
+
+
+def open_csv_text(path: Path):
+    """Open a CSV for reading through a memory-mapped text stream.
+
+    The OS page cache handles prefetch and Python skips one userland buffer
+    copy per read, which matters on multi-gigabyte extracts. Empty files
+    cannot be mapped and fall back to a regular buffered open.
+    """
+    fh = path.open("rb")
+    try:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        fh.close()
+        return path.open("r", newline="", encoding="utf-8")
+    fh.close()
+    return io.TextIOWrapper(io.BufferedReader(_MmapReader(mm)), encoding="utf-8", newline="")
+
 
 def normalize_date(value: str) -> str:
     text = value.strip()
     if not text:
         return ""
-    for fmt in DATE_FORMATS:
-        try:
-            return datetime.strptime(text, fmt).strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-    return text
+
+    cached = _date_cache.get(text)
+    if cached is not None:
+        return cached
+
+    result = None
+    length = len(text)
+    if length in (10, 19):
+        fmt = None
+        if text[2] in "-/":
+            fmt = _DATE_FORMAT_BY_SHAPE.get((length, text[2], 2))
+        elif text[4] in "-/":
+            fmt = _DATE_FORMAT_BY_SHAPE.get((length, text[4], 4))
+        if fmt:
+            try:
+                result = datetime.strptime(text, fmt).strftime("%Y-%m-%d")
+            except ValueError:
+                result = None
+
+    if result is None:
+        result = text
+        for fmt in DATE_FORMATS:
+            try:
+                result = datetime.strptime(text, fmt).strftime("%Y-%m-%d")
+                break
+            except ValueError:
+                continue
+
+    # Date columns repeat heavily, so memoize with a cap to bound memory.
+    if len(_date_cache) < _DATE_CACHE_LIMIT:
+        _date_cache[text] = result
+    return result
+
+
+def dedupe_hash(parts: list[str]) -> int:
+    """Collapse a composite dedupe key to a 64-bit int.
+
+    Storing ints instead of string tuples keeps the `seen` set an order of
+    magnitude smaller on multi-million-row extracts; at 64 bits the collision
+    odds are negligible for realistic row counts.
+    """
+    digest = blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def transform_chunk(
+    raw_rows: list[list[str]],
+    column_count: int,
+    date_indexes: set[int],
+) -> list[list[str]]:
+    """Clean a chunk of raw csv.reader rows; pure so it can run in worker processes."""
+    cleaned_rows: list[list[str]] = []
+    for row in raw_rows:
+        if len(row) != column_count:
+            row = row[:column_count] + [""] * (column_count - len(row))
+        cleaned = [value.strip() for value in row]
+        for i in date_indexes:
+            if cleaned[i]:
+                cleaned[i] = normalize_date(cleaned[i])
+        cleaned_rows.append(cleaned)
+    return cleaned_rows
 
 
 def load_config(path: Path) -> dict[str, Any]:
@@ -78,65 +208,113 @@ def main() -> int:
     date_columns = set(cfg.get("date_columns", []))
     drop_duplicates_by = cfg.get("drop_duplicates_by", [])
 
-    with source_csv.open("r", newline="", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        headers = reader.fieldnames or []
-        rows = list(reader)
-
-    missing_required_cols = [c for c in required_columns if c not in headers]
-
-    transformed: list[dict[str, str]] = []
-    seen = set()
+    seen: set[int] = set()
+    input_rows = 0
+    output_rows = 0
     duplicate_rows_removed = 0
     missing_required_values = 0
 
-    for row in rows:
-        cleaned: dict[str, str] = {}
-        for h in headers:
-            value = (row.get(h) or "").strip()
-            if h in date_columns and value:
-                value = normalize_date(value)
-            cleaned[h] = value
-
-        row_missing = any(not cleaned.get(col, "") for col in required_columns)
-        if row_missing:
-            missing_required_values += 1
-
-        if drop_duplicates_by:
-            dedupe_key = tuple(cleaned.get(col, "") for col in drop_duplicates_by)
-            if dedupe_key in seen:
-                duplicate_rows_removed += 1
-                continue
-            seen.add(dedupe_key)
+    out_fh = None
+    writer = None
+    try:
+        with open_csv_text(source_csv) as fh:
+            # csv.reader with positional indexes: building (and then throwing
+            # away) a dict per row is the main parse overhead of DictReader.
+            reader = csv.reader(fh)
+            headers = next(reader, None) or []
+            column_count = len(headers)
+            missing_required_cols = [c for c in required_columns if c not in headers]
 
-        transformed.append(cleaned)
+            date_indexes = {i for i, h in enumerate(headers) if h in date_columns}
+            required_indexes = [headers.index(c) for c in required_columns if c in headers]
+            dedupe_indexes = [
+                headers.index(c) if c in headers else -1 for c in drop_duplicates_by
+            ]
+
+            if args.apply:
+                output_csv.parent.mkdir(parents=True, exist_ok=True)
+                out_fh = output_csv.open("w", newline="", encoding="utf-8")
+                writer = csv.writer(out_fh)
+                writer.writerow(headers)
+
+            # Stream batch by batch so peak memory stays bounded regardless of
+            # extract size; only the dedupe key set grows with the input. The
+            # cleaning itself fans out to worker processes once the file has
+            # proven large enough to fill a whole batch, while the dedupe set
+            # and the writer stay centralized here to keep ordering exact.
+            executor: ProcessPoolExecutor | None = None
+            try:
+                while True:
+                    batch = list(islice(reader, PARALLEL_BATCH_ROWS))
+                    if not batch:
+                        break
+                    # csv.reader emits [] for blank lines; DictReader skipped them.
+                    batch = [row for row in batch if row]
+                    input_rows += len(batch)
+
+                    if (
+                        executor is None
+                        and len(batch) == PARALLEL_BATCH_ROWS
+                        and (os.cpu_count() or 1) > 1
+                    ):
+                        executor = ProcessPoolExecutor()
+
+                    if executor is not None:
+                        chunks = [
+                            batch[start : start + PARALLEL_CHUNK_ROWS]
+                            for start in range(0, len(batch), PARALLEL_CHUNK_ROWS)
+                        ]
+                        cleaned_iter = chain.from_iterable(
+                            executor.map(transform_chunk, chunks, repeat(column_count), repeat(date_indexes))
+                        )
+                    else:
+                        cleaned_iter = iter(transform_chunk(batch, column_count, date_indexes))
+
+                    for cleaned in cleaned_iter:
+                        row_missing = bool(missing_required_cols) or any(
+                            not cleaned[i] for i in required_indexes
+                        )
+                        if row_missing:
+                            missing_required_values += 1
+
+                        if drop_duplicates_by:
+                            dedupe_key = dedupe_hash(
+                                [cleaned[i] if i >= 0 else "" for i in dedupe_indexes]
+                            )
+                            if dedupe_key in seen:
+                                duplicate_rows_removed += 1
+                                continue
+                            seen.add(dedupe_key)
+
+                        output_rows += 1
+                        if writer is not None:
+                            writer.writerow(cleaned)
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+    finally:
+        if out_fh is not None:
+            out_fh.close()
 
     summary = {
         "config": str(config_path),
         "source_csv": str(source_csv),
         "output_csv": str(output_csv),
         "dry_run": not args.apply,
-        "input_rows": len(rows),
-        "output_rows": len(transformed),
+        "input_rows": input_rows,
+        "output_rows": output_rows,
         "duplicate_rows_removed": duplicate_rows_removed,
         "missing_required_columns": missing_required_cols,
         "rows_missing_required_values": missing_required_values,
         "required_columns": required_columns,
     }
 
-    if args.apply:
-        output_csv.parent.mkdir(parents=True, exist_ok=True)
-        with output_csv.open("w", newline="", encoding="utf-8") as fh:
-            writer = csv.DictWriter(fh, fieldnames=headers)
-            writer.writeheader()
-            writer.writerows(transformed)
-
     summary_json.parent.mkdir(parents=True, exist_ok=True)
-    summary_json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    dump_json(summary_json, summary)
 
     mode = "APPLY" if args.apply else "DRY-RUN"
     print(
-        f"ETL {mode} complete: input={len(rows)} output={len(transformed)} "
+        f"ETL {mode} complete: input={input_rows} output={output_rows} "
         f"duplicates_removed={duplicate_rows_removed}"
     )
     print(f"Summary: {summary_json}")
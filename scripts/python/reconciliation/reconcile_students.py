@@ -6,9 +6,24 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import sys
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dump_json(path: Path, payload: Any) -> None:
+    """Serialize with orjson when available; stdlib json otherwise."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
 
 def normalize(value: Any) -> str:
     if value is None:
@@ -16,25 +31,37 @@ def normalize(value: Any) -> str:
     return str(value).strip()
 
 
-def read_rows(path: Path) -> list[dict[str, str]]:
-    with path.open("r", newline="", encoding="utf-8") as fh:
-        return list(csv.DictReader(fh))
+def index_rows(
+    rows: Iterable[dict[str, str]],
+    key: str,
+    columns: list[str],
+) -> tuple[dict[str, tuple[str, ...]], int, int]:
+    """Index rows by key, keeping only the compared columns as a normalized tuple.
 
-
-def index_rows(rows: list[dict[str, str]], key: str) -> tuple[dict[str, dict[str, str]], int, int]:
-    indexed: dict[str, dict[str, str]] = {}
+    Columnar-style storage: a flat tuple per record instead of the full row
+    dict, normalized once at load rather than per comparison.
+    """
+    indexed: dict[str, tuple[str, ...]] = {}
     duplicates = 0
     missing_key = 0
 
+    # Hot loop: DictReader cells are always str (or None for short rows), so
+    # a bound str.strip replaces the generic normalize() call per cell.
+    # Values are interned so repeated labels (status, department, ...) share
+    # one object across both indexes: equal comparisons hit the pointer fast
+    # path and duplicate strings stop costing memory.
+    _strip = str.strip
+    _intern = sys.intern
     for row in rows:
-        record_key = normalize(row.get(key))
+        get = row.get
+        record_key = _strip(get(key) or "")
         if not record_key:
             missing_key += 1
             continue
         if record_key in indexed:
             duplicates += 1
             continue
-        indexed[record_key] = row
+        indexed[record_key] = tuple(_intern(_strip(get(col) or "")) for col in columns)
 
     return indexed, duplicates, missing_key
 
@@ -72,15 +99,22 @@ def main() -> int:
     if not target_path.exists():
         raise FileNotFoundError(f"Target CSV not found: {target_path}")
 
-    source_rows = read_rows(source_path)
-    target_rows = read_rows(target_path)
-
-    source_idx, source_dupes, source_missing_key = index_rows(source_rows, args.key)
-    target_idx, target_dupes, target_missing_key = index_rows(target_rows, args.key)
+    # Index straight off the streaming readers; only the keyed rows are kept,
+    # never a second full copy of each file.
+    with source_path.open("r", newline="", encoding="utf-8") as fh:
+        source_idx, source_dupes, source_missing_key = index_rows(
+            csv.DictReader(fh), args.key, args.compare_columns
+        )
+    with target_path.open("r", newline="", encoding="utf-8") as fh:
+        target_idx, target_dupes, target_missing_key = index_rows(
+            csv.DictReader(fh), args.key, args.compare_columns
+        )
 
-    all_keys = sorted(set(source_idx) | set(target_idx))
+    # Source keys in input order, then target-only keys: the dicts are the
+    # hash tables already, so no union set and no O(n log n) string sort.
+    all_keys = list(source_idx)
+    all_keys.extend(key for key in target_idx if key not in source_idx)
 
-    result_rows: list[dict[str, str]] = []
     counts = {
         "match": 0,
         "mismatch": 0,
@@ -88,36 +122,6 @@ def main() -> int:
         "target_only": 0,
     }
 
-    for record_key in all_keys:
-        source_row = source_idx.get(record_key)
-        target_row = target_idx.get(record_key)
-
-        if source_row and not target_row:
-            status = "source_only"
-            mismatches: list[str] = []
-        elif target_row and not source_row:
-            status = "target_only"
-            mismatches = []
-        else:
-            mismatches = []
-            for col in args.compare_columns:
-                if normalize(source_row.get(col)) != normalize(target_row.get(col)):
-                    mismatches.append(col)
-            status = "mismatch" if mismatches else "match"
-
-        counts[status] += 1
-
-        out_row = {
-            "record_key": record_key,
-            "status": status,
-            "mismatch_columns": "|".join(mismatches),
-        }
-        for col in args.compare_columns:
-            out_row[f"source_{col}"] = normalize(source_row.get(col)) if source_row else ""
-            out_row[f"target_{col}"] = normalize(target_row.get(col)) if target_row else ""
-
-        result_rows.append(out_row)
-
     output_path.parent.mkdir(parents=True, exist_ok=True)
     summary_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -125,21 +129,60 @@ def main() -> int:
         item for col in args.compare_columns for item in (f"source_{col}", f"target_{col}")
     ]
 
+    column_count = len(args.compare_columns)
+    empty_values = ("",) * column_count
+
+    # Write each reconciled row as it is produced instead of accumulating a
+    # result list the size of both inputs; rows are positional tuples in
+    # fieldnames order, skipping DictWriter's per-column name lookup.
     with output_path.open("w", newline="", encoding="utf-8") as fh:
-        writer = csv.DictWriter(fh, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(result_rows)
+        writer = csv.writer(fh)
+        writer.writerow(fieldnames)
+
+        for record_key in all_keys:
+            source_values = source_idx.get(record_key)
+            target_values = target_idx.get(record_key)
+
+            if target_values is None:
+                status = "source_only"
+                mismatches: list[str] = []
+            elif source_values is None:
+                status = "target_only"
+                mismatches = []
+            else:
+                mismatches = [
+                    col
+                    for col, source_value, target_value in zip(
+                        args.compare_columns, source_values, target_values
+                    )
+                    if source_value != target_value
+                ]
+                status = "mismatch" if mismatches else "match"
+
+            counts[status] += 1
+
+            if source_values is None:
+                source_values = empty_values
+            if target_values is None:
+                target_values = empty_values
+
+            out_row = [record_key, status, "|".join(mismatches)]
+            for i in range(column_count):
+                out_row.append(source_values[i])
+                out_row.append(target_values[i])
+
+            writer.writerow(out_row)
 
     summary = {
-        "source_records": len(source_rows),
-        "target_records": len(target_rows),
+        "source_records": len(source_idx) + source_dupes + source_missing_key,
+        "target_records": len(target_idx) + target_dupes + target_missing_key,
         "source_duplicates_ignored": source_dupes,
         "target_duplicates_ignored": target_dupes,
         "source_missing_key_rows": source_missing_key,
         "target_missing_key_rows": target_missing_key,
         "counts": counts,
     }
-    summary_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    dump_json(summary_path, summary)
 
     print(f"Reconciliation complete: {counts} -> {output_path}")
     return 0
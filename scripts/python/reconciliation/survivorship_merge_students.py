@@ -6,9 +6,24 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import sys
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dump_json(path: Path, payload: Any) -> None:
+    """Serialize with orjson when available; stdlib json otherwise."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
 
 def normalize(value: Any) -> str:
     if value is None:
@@ -16,41 +31,50 @@ def normalize(value: Any) -> str:
     return str(value).strip()
 
 
-def read_rows(path: Path) -> list[dict[str, str]]:
-    with path.open("r", newline="", encoding="utf-8") as fh:
-        return list(csv.DictReader(fh))
-
-
-def index_rows(rows: list[dict[str, str]], key_column: str) -> tuple[dict[str, dict[str, str]], int, int]:
-    indexed: dict[str, dict[str, str]] = {}
+def index_rows(
+    rows: Iterable[dict[str, str]],
+    key_column: str,
+    columns: list[str],
+) -> tuple[dict[str, tuple[str, ...]], int, int]:
+    """Index rows by key, keeping only the merged columns as a normalized tuple.
+
+    Columnar-style storage: a flat tuple per record instead of the full row
+    dict, normalized once at load rather than per merge decision.
+    """
+    indexed: dict[str, tuple[str, ...]] = {}
     duplicate_count = 0
     missing_key_rows = 0
 
+    # Hot loop: DictReader cells are always str (or None for short rows), so
+    # a bound str.strip replaces the generic normalize() call per cell.
+    # Values are interned so repeated labels (status, department, ...) share
+    # one object across both indexes: equal comparisons hit the pointer fast
+    # path and duplicate strings stop costing memory.
+    _strip = str.strip
+    _intern = sys.intern
     for row in rows:
-        record_key = normalize(row.get(key_column))
+        get = row.get
+        record_key = _strip(get(key_column) or "")
         if not record_key:
             missing_key_rows += 1
             continue
         if record_key in indexed:
             duplicate_count += 1
             continue
-        indexed[record_key] = row
+        indexed[record_key] = tuple(_intern(_strip(get(col) or "")) for col in columns)
 
     return indexed, duplicate_count, missing_key_rows
 
 
 def resolve_columns(
-    source_rows: list[dict[str, str]],
-    target_rows: list[dict[str, str]],
+    source_columns: list[str],
+    target_columns: list[str],
     key_column: str,
     requested_columns: list[str],
 ) -> list[str]:
     if requested_columns:
         return [col for col in requested_columns if col != key_column]
 
-    source_columns = list(source_rows[0].keys()) if source_rows else []
-    target_columns = list(target_rows[0].keys()) if target_rows else []
-
     combined = []
     seen: set[str] = set()
     for col in source_columns + target_columns:
@@ -61,33 +85,6 @@ def resolve_columns(
     return combined
 
 
-def choose_value(
-    source_value: str,
-    target_value: str,
-    priority: list[str],
-) -> tuple[str, str, bool]:
-    """Return (chosen_value, chosen_from, is_conflict)."""
-    source_value = normalize(source_value)
-    target_value = normalize(target_value)
-
-    if source_value and target_value and source_value == target_value:
-        return source_value, "both", False
-
-    if source_value and target_value and source_value != target_value:
-        preferred = priority[0]
-        if preferred == "source":
-            return source_value, "source", True
-        return target_value, "target", True
-
-    if source_value:
-        return source_value, "source", False
-
-    if target_value:
-        return target_value, "target", False
-
-    return "", "none", False
-
-
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description=(
@@ -157,17 +154,29 @@ def main() -> int:
 
     priority = validate_priority(args.priority)
 
-    source_rows = read_rows(source_path)
-    target_rows = read_rows(target_path)
-
-    source_idx, source_dupes, source_missing = index_rows(source_rows, args.key)
-    target_idx, target_dupes, target_missing = index_rows(target_rows, args.key)
-
-    merge_columns = resolve_columns(source_rows, target_rows, args.key, args.columns)
-    all_keys = sorted(set(source_idx) | set(target_idx))
-
-    merged_rows: list[dict[str, str]] = []
-    conflict_rows: list[dict[str, str]] = []
+    # Index straight off the streaming readers, keeping the headers for
+    # column resolution; no full row list is ever materialized.
+    # Column resolution needs only headers, so peek at them before indexing
+    # and then keep just the merge columns per record.
+    source_headers = []
+    target_headers = []
+    with source_path.open("r", newline="", encoding="utf-8") as fh:
+        source_headers = list(csv.DictReader(fh).fieldnames or [])
+    with target_path.open("r", newline="", encoding="utf-8") as fh:
+        target_headers = list(csv.DictReader(fh).fieldnames or [])
+
+    merge_columns = resolve_columns(source_headers, target_headers, args.key, args.columns)
+
+    with source_path.open("r", newline="", encoding="utf-8") as fh:
+        source_idx, source_dupes, source_missing = index_rows(csv.DictReader(fh), args.key, merge_columns)
+    with target_path.open("r", newline="", encoding="utf-8") as fh:
+        target_idx, target_dupes, target_missing = index_rows(csv.DictReader(fh), args.key, merge_columns)
+    # Source keys in input order, then target-only keys: no union set and no
+    # O(n log n) string sort over the combined key space.
+    all_keys = list(source_idx)
+    all_keys.extend(key for key in target_idx if key not in source_idx)
+
+    merged_records = 0
 
     counts = {
         "both_sources": 0,
@@ -176,80 +185,104 @@ def main() -> int:
         "field_conflicts": 0,
     }
 
-    for record_key in all_keys:
-        source_row = source_idx.get(record_key)
-        target_row = target_idx.get(record_key)
-
-        if source_row and target_row:
-            record_origin = "both"
-            counts["both_sources"] += 1
-        elif source_row:
-            record_origin = "source_only"
-            counts["source_only"] += 1
-        else:
-            record_origin = "target_only"
-            counts["target_only"] += 1
-
-        merged = {
-            args.key: record_key,
-            "record_origin": record_origin,
-        }
-
-        for column in merge_columns:
-            source_value = normalize(source_row.get(column)) if source_row else ""
-            target_value = normalize(target_row.get(column)) if target_row else ""
-            chosen_value, chosen_from, is_conflict = choose_value(source_value, target_value, priority)
-
-            merged[column] = chosen_value
-            merged[f"source_of_{column}"] = chosen_from
-
-            if is_conflict:
-                counts["field_conflicts"] += 1
-                conflict_rows.append(
-                    {
-                        "record_key": record_key,
-                        "column": column,
-                        "source_value": source_value,
-                        "target_value": target_value,
-                        "chosen_value": chosen_value,
-                        "chosen_from": chosen_from,
-                        "priority": ">".join(priority),
-                    }
-                )
-
-        merged_rows.append(merged)
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as fh:
-        fieldnames = [args.key, "record_origin"] + merge_columns + [f"source_of_{col}" for col in merge_columns]
-        writer = csv.DictWriter(fh, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(merged_rows)
-
     if args.conflicts_output:
         conflicts_path = Path(args.conflicts_output)
     else:
         conflicts_path = output_path.with_name(output_path.stem + "_conflicts.csv")
 
+    output_path.parent.mkdir(parents=True, exist_ok=True)
     conflicts_path.parent.mkdir(parents=True, exist_ok=True)
-    with conflicts_path.open("w", newline="", encoding="utf-8") as fh:
-        fieldnames = [
-            "record_key",
-            "column",
-            "source_value",
-            "target_value",
-            "chosen_value",
-            "chosen_from",
-            "priority",
-        ]
-        writer = csv.DictWriter(fh, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(conflict_rows)
+
+    merged_fieldnames = (
+        [args.key, "record_origin"] + merge_columns + [f"source_of_{col}" for col in merge_columns]
+    )
+    conflict_fieldnames = [
+        "record_key",
+        "column",
+        "source_value",
+        "target_value",
+        "chosen_value",
+        "chosen_from",
+        "priority",
+    ]
+
+    # Merged rows and conflicts stream straight to their writers so memory
+    # stays at the two key indexes regardless of output size.
+    with output_path.open("w", newline="", encoding="utf-8") as out_fh, conflicts_path.open(
+        "w", newline="", encoding="utf-8"
+    ) as conflicts_fh:
+        # Positional writers: rows are tuples in fieldnames order, skipping
+        # DictWriter's per-column name lookup on every row.
+        writer = csv.writer(out_fh)
+        writer.writerow(merged_fieldnames)
+        conflict_writer = csv.writer(conflicts_fh)
+        conflict_writer.writerow(conflict_fieldnames)
+
+        # Conflict resolution is inlined with the priority decision hoisted to
+        # one boolean; index tuples are already normalized at load time, so no
+        # value is normalized again here.
+        source_first = priority[0] == "source"
+        priority_label = ">".join(priority)
+
+        for record_key in all_keys:
+            source_values = source_idx.get(record_key)
+            target_values = target_idx.get(record_key)
+
+            if source_values is not None and target_values is not None:
+                record_origin = "both"
+                counts["both_sources"] += 1
+            elif source_values is not None:
+                record_origin = "source_only"
+                counts["source_only"] += 1
+            else:
+                record_origin = "target_only"
+                counts["target_only"] += 1
+
+            chosen_values: list[str] = []
+            chosen_origins: list[str] = []
+
+            for i, column in enumerate(merge_columns):
+                source_value = source_values[i] if source_values is not None else ""
+                target_value = target_values[i] if target_values is not None else ""
+
+                if source_value:
+                    if target_value:
+                        if source_value == target_value:
+                            chosen_value, chosen_from = source_value, "both"
+                        elif source_first:
+                            chosen_value, chosen_from = source_value, "source"
+                        else:
+                            chosen_value, chosen_from = target_value, "target"
+                        if source_value != target_value:
+                            counts["field_conflicts"] += 1
+                            conflict_writer.writerow(
+                                (
+                                    record_key,
+                                    column,
+                                    source_value,
+                                    target_value,
+                                    chosen_value,
+                                    chosen_from,
+                                    priority_label,
+                                )
+                            )
+                    else:
+                        chosen_value, chosen_from = source_value, "source"
+                elif target_value:
+                    chosen_value, chosen_from = target_value, "target"
+                else:
+                    chosen_value, chosen_from = "", "none"
+
+                chosen_values.append(chosen_value)
+                chosen_origins.append(chosen_from)
+
+            writer.writerow([record_key, record_origin, *chosen_values, *chosen_origins])
+            merged_records += 1
 
     summary = {
-        "source_records": len(source_rows),
-        "target_records": len(target_rows),
-        "merged_records": len(merged_rows),
+        "source_records": len(source_idx) + source_dupes + source_missing,
+        "target_records": len(target_idx) + target_dupes + target_missing,
+        "merged_records": merged_records,
         "priority": priority,
         "key_column": args.key,
         "merge_columns": merge_columns,
@@ -262,11 +295,11 @@ def main() -> int:
     }
 
     summary_path.parent.mkdir(parents=True, exist_ok=True)
-    summary_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    dump_json(summary_path, summary)
 
     print(
         "Survivorship merge complete: "
-        f"records={len(merged_rows)} "
+        f"records={merged_records} "
         f"both={counts['both_sources']} "
         f"source_only={counts['source_only']} "
         f"target_only={counts['target_only']} "
@@ -9,6 +9,19 @@ import json
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dump_json(path: Path, payload: Any) -> None:
+    """Serialize with orjson when available; stdlib json otherwise."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
 
 def parse_float(value: str) -> float | None:
     try:
@@ -17,14 +30,6 @@ def parse_float(value: str) -> float | None:
         return None
 
 
-def write_csv(path: Path, rows: list[dict[str, Any]], fieldnames: list[str]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="", encoding="utf-8") as fh:
-        writer = csv.DictWriter(fh, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
-
-
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description=(
@@ -48,49 +53,86 @@ def main() -> int:
     if not input_path.exists():
         raise FileNotFoundError(f"Input file not found: {input_path}")
 
-    with input_path.open("r", newline="", encoding="utf-8") as fh:
-        rows = list(csv.DictReader(fh))
-
-    fieldnames = list(rows[0].keys()) if rows else []
-    anomalies: list[dict[str, Any]] = []
-
-    for row in rows:
-        key_val = (row.get(args.key_column) or "").strip()
-        score_val = (row.get(args.score_column) or "").strip()
-        score_num = parse_float(score_val)
-
-        if not key_val:
-            issue = dict(row)
-            issue["issue"] = f"missing_{args.key_column}"
-            anomalies.append(issue)
-
-        if score_val == "":
-            issue = dict(row)
-            issue["issue"] = f"missing_{args.score_column}"
-            anomalies.append(issue)
-        elif score_num is None:
-            issue = dict(row)
-            issue["issue"] = f"invalid_{args.score_column}"
-            anomalies.append(issue)
-        elif score_num < args.low_score_threshold:
-            issue = dict(row)
-            issue["issue"] = "low_score"
-            anomalies.append(issue)
-
     out_dir.mkdir(parents=True, exist_ok=True)
     cleaned_csv = out_dir / "cleaned.csv"
     anomalies_csv = out_dir / "anomalies.csv"
     summary_json = out_dir / "summary.json"
     workbook_path = out_dir / "audit_packet.xlsx"
 
-    write_csv(cleaned_csv, rows, fieldnames)
-    anomaly_fields = fieldnames + ["issue"] if fieldnames else ["issue"]
-    write_csv(anomalies_csv, anomalies, anomaly_fields)
+    row_count = 0
+    anomaly_count = 0
+
+    # One streaming pass: each input row goes straight to cleaned.csv, and any
+    # anomalies it raises go straight to anomalies.csv. Nothing is retained,
+    # so the packet scales to inputs far larger than memory.
+    # Hoisted out of the row loop: issue labels are constant per run and the
+    # column/threshold lookups cost an attribute access per row otherwise.
+    key_column = args.key_column
+    score_column = args.score_column
+    low_threshold = args.low_score_threshold
+    missing_key_issue = f"missing_{key_column}"
+    missing_score_issue = f"missing_{score_column}"
+    invalid_score_issue = f"invalid_{score_column}"
+
+    with input_path.open("r", newline="", encoding="utf-8") as fh:
+        # csv.reader with positional indexes: building (and then throwing
+        # away) a dict per row is the main parse overhead of DictReader.
+        reader = csv.reader(fh)
+        fieldnames = next(reader, None) or []
+        column_count = len(fieldnames)
+        anomaly_fields = fieldnames + ["issue"] if fieldnames else ["issue"]
+        key_index = fieldnames.index(key_column) if key_column in fieldnames else -1
+        score_index = fieldnames.index(score_column) if score_column in fieldnames else -1
+
+        with cleaned_csv.open("w", newline="", encoding="utf-8") as clean_fh, anomalies_csv.open(
+            "w", newline="", encoding="utf-8"
+        ) as anom_fh:
+            clean_writer = csv.writer(clean_fh)
+            clean_writer.writerow(fieldnames)
+            anom_writer = csv.writer(anom_fh)
+            anom_writer.writerow(anomaly_fields)
+
+            for row in reader:
+                if not row:
+                    continue
+                row_count += 1
+                if len(row) != column_count:
+                    row = row[:column_count] + [""] * (column_count - len(row))
+                clean_writer.writerow(row)
+
+                key_val = row[key_index].strip() if key_index >= 0 else ""
+                score_val = row[score_index].strip() if score_index >= 0 else ""
+
+                # Anomaly rows reuse the live row list with the issue label
+                # appended — no per-row dict or copy is allocated.
+                if not key_val:
+                    row.append(missing_key_issue)
+                    anom_writer.writerow(row)
+                    del row[-1]
+                    anomaly_count += 1
+
+                # Parse only when a value is present, so empty scores never
+                # take the exception path inside parse_float.
+                if score_val == "":
+                    issue = missing_score_issue
+                else:
+                    score_num = parse_float(score_val)
+                    if score_num is None:
+                        issue = invalid_score_issue
+                    elif score_num < low_threshold:
+                        issue = "low_score"
+                    else:
+                        issue = None
+                if issue is not None:
+                    row.append(issue)
+                    anom_writer.writerow(row)
+                    del row[-1]
+                    anomaly_count += 1
 
     summary = {
         "input": str(input_path),
-        "rows": len(rows),
-        "anomaly_rows": len(anomalies),
+        "rows": row_count,
+        "anomaly_rows": anomaly_count,
         "key_column": args.key_column,
         "score_column": args.score_column,
         "low_score_threshold": args.low_score_threshold,
@@ -101,29 +143,31 @@ def main() -> int:
             "workbook": str(workbook_path),
         },
     }
-    summary_json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    dump_json(summary_json, summary)
 
     workbook_written = False
     try:
         from openpyxl import Workbook  # type: ignore
 
-        wb = Workbook()
-        ws_data = wb.active
-        ws_data.title = "Data"
-        if fieldnames:
-            ws_data.append(fieldnames)
-            for row in rows:
-                ws_data.append([row.get(col, "") for col in fieldnames])
+        # write_only streams each appended row straight to the zip instead of
+        # keeping a Cell object per value; there is no default sheet to retitle.
+        wb = Workbook(write_only=True)
+        ws_data = wb.create_sheet("Data")
+        # The workbook sheets re-read the artifacts written above instead of
+        # holding every row in memory across the whole run.
+        with cleaned_csv.open("r", newline="", encoding="utf-8") as fh:
+            for row_values in csv.reader(fh):
+                ws_data.append(row_values)
 
         ws_anom = wb.create_sheet("Anomalies")
-        ws_anom.append(anomaly_fields)
-        for row in anomalies:
-            ws_anom.append([row.get(col, "") for col in anomaly_fields])
+        with anomalies_csv.open("r", newline="", encoding="utf-8") as fh:
+            for row_values in csv.reader(fh):
+                ws_anom.append(row_values)
 
         ws_summary = wb.create_sheet("Summary")
         ws_summary.append(["metric", "value"])
-        ws_summary.append(["rows", len(rows)])
-        ws_summary.append(["anomaly_rows", len(anomalies)])
+        ws_summary.append(["rows", row_count])
+        ws_summary.append(["anomaly_rows", anomaly_count])
         ws_summary.append(["low_score_threshold", args.low_score_threshold])
 
         wb.save(workbook_path)
@@ -5,10 +5,33 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import stat
+from operator import itemgetter
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dump_json(path: Path, payload: Any) -> None:
+    """Serialize with orjson when available; stdlib json otherwise."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def dumps_json_line(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -23,7 +46,22 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def stat_or_none(path: Path) -> os.stat_result | None:
+    """One stat syscall instead of the exists/is_file/stat triple."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
 def load_json(path: Path) -> dict[str, Any]:
+    """Parse with orjson when available; stdlib json otherwise.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers keep
+    a single except clause for both parsers.
+    """
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
     with path.open("r", encoding="utf-8") as fh:
         return json.load(fh)
 
@@ -31,11 +69,65 @@ def load_json(path: Path) -> dict[str, Any]:
 def normalize_history(payload: Any) -> list[dict[str, Any]]:
     if isinstance(payload, dict):
         runs = payload.get("runs")
-        if isinstance(runs, list):
-            return [row for row in runs if isinstance(row, dict)]
-    if isinstance(payload, list):
-        return [row for row in payload if isinstance(row, dict)]
-    return []
+        rows = runs if isinstance(runs, list) else []
+    elif isinstance(payload, list):
+        rows = payload
+    else:
+        rows = []
+
+    normalized = [row for row in rows if isinstance(row, dict)]
+    # Guarantee a string sort field on every row so the merge can sort with
+    # a C-level itemgetter instead of a per-comparison lambda frame.
+    for row in normalized:
+        row["generated_utc"] = str(row.get("generated_utc") or "")
+    return normalized
+
+
+def append_history_jsonl(path: Path, entry: dict[str, Any], max_entries: int) -> int:
+    """Append one run entry to a JSONL history log, compacting when oversized.
+
+    The hot path is a single append; the full read-dedupe-sort-rewrite only
+    happens once the log holds more than twice max_entries lines. Returns the
+    number of entries the log holds afterwards.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("ab") as fh:
+        fh.write(dumps_json_line(entry) + b"\n")
+
+    line_count = 0
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            line_count += chunk.count(b"\n")
+    if line_count <= 2 * max_entries:
+        return line_count
+
+    # Compaction: keep the latest entry per run_id, newest first, truncated
+    # to max_entries, swapped in atomically.
+    runs: dict[str, dict[str, Any]] = {}
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(row, dict):
+                run_id = str(row.get("run_id") or "")
+                if run_id:
+                    row["generated_utc"] = str(row.get("generated_utc") or "")
+                    runs[run_id] = row
+
+    merged = sorted(runs.values(), key=itemgetter("generated_utc"), reverse=True)
+    merged = merged[:max_entries]
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as fh:
+        for row in merged:
+            fh.write(dumps_json_line(row) + b"\n")
+    os.replace(tmp_path, path)
+    return len(merged)
 
 
 def main() -> int:
@@ -68,17 +160,35 @@ def main() -> int:
         },
     }
 
+    # A .jsonl history is an append-only log: the hot path writes one line
+    # instead of rereading, resorting, and rewriting the whole index.
+    if history_path.suffix == ".jsonl":
+        total = append_history_jsonl(history_path, entry, args.max_entries)
+        print(
+            "Run history appended: "
+            f"run_id={run_id}, total_entries={total} -> {history_path}"
+        )
+        return 0
+
     existing_runs: list[dict[str, Any]] = []
-    if history_path.exists() and history_path.is_file():
+    history_st = stat_or_none(history_path)
+    if history_st is not None and stat.S_ISREG(history_st.st_mode):
         try:
             existing_payload = load_json(history_path)
             existing_runs = normalize_history(existing_payload)
         except json.JSONDecodeError:
             existing_runs = []
 
-    merged_runs = [row for row in existing_runs if str(row.get("run_id") or "") != run_id]
-    merged_runs.append(entry)
-    merged_runs.sort(key=lambda row: str(row.get("generated_utc") or ""), reverse=True)
+    # Newest-wins upsert keyed by run_id, same invariant as the JSONL
+    # compactor: one dict pass instead of a filtered list copy, duplicate
+    # ids keep their last occurrence, and rows without a run_id drop out.
+    by_id: dict[str, dict[str, Any]] = {}
+    for row in existing_runs:
+        row_id = str(row.get("run_id") or "")
+        if row_id:
+            by_id[row_id] = row
+    by_id[run_id] = entry
+    merged_runs = sorted(by_id.values(), key=itemgetter("generated_utc"), reverse=True)
     merged_runs = merged_runs[: args.max_entries]
 
     payload = {
@@ -89,7 +199,7 @@ def main() -> int:
     }
 
     history_path.parent.mkdir(parents=True, exist_ok=True)
-    history_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    dump_json(history_path, payload)
 
     print(
         "Run history updated: "
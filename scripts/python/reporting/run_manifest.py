@@ -6,10 +6,28 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import mmap
+import os
+import stat
+import time
+from collections.abc import Iterator
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dumps_json(payload: Any) -> bytes:
+    """Serialize with orjson when available; stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, indent=2).encode("utf-8")
+
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -25,48 +43,163 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--log-file", required=True, help="Path to workflow log file")
     parser.add_argument("--steps-file", default="", help="Optional step status CSV path")
     parser.add_argument("--manifest", required=True, help="Output manifest JSON path")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Omit per-file report/output records (counts and log info only)",
+    )
     return parser.parse_args()
 
 
-def collect_files(root: Path) -> list[dict[str, Any]]:
-    if not root.exists() or not root.is_dir():
-        return []
+def stat_or_none(path: Path) -> os.stat_result | None:
+    """One stat syscall instead of the exists/is_file/stat triple."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
 
-    records: list[dict[str, Any]] = []
-    for path in sorted(p for p in root.rglob("*") if p.is_file()):
-        stat = path.stat()
-        records.append(
-            {
-                "relative_path": str(path.relative_to(root)),
-                "size_bytes": stat.st_size,
-                "modified_utc": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat(),
-            }
-        )
-    return records
+
+def scan_files(root: Path) -> list[tuple[str, int, float]]:
+    """Walk root and return sorted (path, size, mtime) tuples.
+
+    Iterative os.scandir walk: each DirEntry carries the stat buffer the
+    directory enumeration already filled, so no second stat syscall per
+    file the way rglob + stat pays. Only three scalars are kept per file;
+    the JSON records are built lazily by iter_records at write time.
+    """
+    found: list[tuple[str, int, float]] = []
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with entries:
+            # Directory descent stays symlink-free to avoid cycles, but the
+            # file test follows links so symlinked artifacts are manifested
+            # like the rglob walk did; regular files still read the stat the
+            # scandir enumeration already cached.
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    found.append((entry.path, st.st_size, st.st_mtime))
+
+    found.sort()
+    return found
+
+
+def iter_records(found: list[tuple[str, int, float]], root: Path) -> Iterator[dict[str, Any]]:
+    # Paths from scan_files all start with the resolved root, so the relative
+    # path is a plain slice past "<root>/" -- no os.path.relpath parsing and no
+    # Path object per file.
+    prefix_len = len(str(root)) + 1
+    # time.gmtime + strftime formats the timestamp without building a
+    # datetime object per file; mtimes round to whole seconds.
+    _gmtime = time.gmtime
+    _strftime = time.strftime
+    for path, size, mtime in found:
+        yield {
+            "relative_path": path[prefix_len:],
+            "size_bytes": size,
+            "modified_utc": _strftime("%Y-%m-%dT%H:%M:%S+00:00", _gmtime(mtime)),
+        }
+
+
+def write_manifest(
+    path: Path,
+    header: dict[str, Any],
+    file_arrays: list[tuple[str, Iterator[dict[str, Any]]]],
+) -> None:
+    """Write the manifest with the file arrays streamed one record at a time.
+
+    The header is serialized whole (it is small); the reports/outputs arrays
+    are appended record by record so peak memory stays flat no matter how
+    many artifacts a run produced.
+
+    The manifest is staged in a sibling .tmp file and swapped in with
+    os.replace (atomic on POSIX and Windows), so readers never observe a
+    half-written JSON if the process dies mid-write.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as fh:
+        head = dumps_json(header)
+        fh.write(head[: head.rindex(b"}")].rstrip())
+        for name, records in file_arrays:
+            fh.write(b',\n  "' + name.encode("ascii") + b'": [')
+            first = True
+            for record in records:
+                fh.write(b"\n    " if first else b",\n    ")
+                fh.write(dumps_json(record).replace(b"\n", b"\n    "))
+                first = False
+            fh.write(b"]" if first else b"\n  ]")
+        fh.write(b"\n}")
+    os.replace(tmp_path, path)
+
+
+def _safe_int(value: str) -> int | None:
+    """Parse an int directly; bad or empty cells return None.
+
+    One int() call in the happy path instead of an isdigit/lstrip validation
+    string plus a second parse.
+    """
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
 
 
 def load_steps_csv(path: Path) -> list[dict[str, Any]]:
-    if not path.exists() or not path.is_file():
+    st = stat_or_none(path)
+    if st is None or not stat.S_ISREG(st.st_mode):
         return []
 
     rows: list[dict[str, Any]] = []
     with path.open("r", newline="", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        for item in reader:
-            attempt_raw = (item.get("attempt") or "").strip()
-            max_attempts_raw = (item.get("max_attempts") or "").strip()
-            exit_code_raw = (item.get("exit_code") or "").strip()
-            duration_raw = (item.get("duration_seconds") or "").strip()
+        # csv.reader with column indexes resolved once from the header: no
+        # per-row dict from DictReader that is immediately re-keyed anyway.
+        reader = csv.reader(fh)
+        header = next(reader, None)
+        if not header:
+            return []
+
+        # Columns absent from the header index into a sentinel slot past the
+        # normalized row, which always holds "".
+        sentinel = len(header)
+        width = sentinel + 1
+        col = {name: i for i, name in enumerate(header)}.get
+        step_i = col("step", sentinel)
+        attempt_i = col("attempt", sentinel)
+        max_attempts_i = col("max_attempts", sentinel)
+        status_i = col("status", sentinel)
+        exit_code_i = col("exit_code", sentinel)
+        start_i = col("start_utc", sentinel)
+        end_i = col("end_utc", sentinel)
+        duration_i = col("duration_seconds", sentinel)
+
+        for row in reader:
+            if not row:
+                continue
+            if len(row) == sentinel:
+                row.append("")
+            else:
+                row = row[:sentinel] + [""] * (width - min(len(row), sentinel))
             rows.append(
                 {
-                    "step": (item.get("step") or "").strip(),
-                    "attempt": int(attempt_raw) if attempt_raw.isdigit() else None,
-                    "max_attempts": int(max_attempts_raw) if max_attempts_raw.isdigit() else None,
-                    "status": (item.get("status") or "").strip(),
-                    "exit_code": int(exit_code_raw) if exit_code_raw.lstrip("-").isdigit() else None,
-                    "start_utc": (item.get("start_utc") or "").strip(),
-                    "end_utc": (item.get("end_utc") or "").strip(),
-                    "duration_seconds": int(duration_raw) if duration_raw.isdigit() else None,
+                    "step": row[step_i].strip(),
+                    "attempt": _safe_int(row[attempt_i].strip()),
+                    "max_attempts": _safe_int(row[max_attempts_i].strip()),
+                    "status": row[status_i].strip(),
+                    "exit_code": _safe_int(row[exit_code_i].strip()),
+                    "start_utc": row[start_i].strip(),
+                    "end_utc": row[end_i].strip(),
+                    "duration_seconds": _safe_int(row[duration_i].strip()),
                 }
             )
     return rows
@@ -81,14 +214,30 @@ def main() -> int:
     steps_file = Path(args.steps_file).resolve() if args.steps_file else None
     manifest_path = Path(args.manifest).resolve()
 
-    report_files = collect_files(report_dir)
-    output_files = collect_files(output_dir)
+    report_found = scan_files(report_dir)
+    output_found = scan_files(output_dir)
     steps = load_steps_csv(steps_file) if steps_file else []
     failed_steps = [row for row in steps if row.get("status") == "failed"]
     retried_steps = [row for row in steps if (row.get("attempt") or 0) > 1]
 
-    log_exists = log_file.exists()
-    log_size = log_file.stat().st_size if log_exists else 0
+    log_st = stat_or_none(log_file)
+    log_exists = log_st is not None and stat.S_ISREG(log_st.st_mode)
+    log_size = log_st.st_size if log_exists else 0
+
+    # mmap + find scans the log at memchr speed without reading it into a
+    # Python bytes object; an unterminated final line still counts as a
+    # line. Empty files cannot be mapped.
+    log_line_count = 0
+    if log_exists and log_size:
+        with log_file.open("rb") as fh:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                find = mm.find
+                pos = find(b"\n")
+                while pos != -1:
+                    log_line_count += 1
+                    pos = find(b"\n", pos + 1)
+                if mm[-1] != 0x0A:
+                    log_line_count += 1
 
     payload = {
         "run_id": args.run_id,
@@ -101,9 +250,9 @@ def main() -> int:
             "steps_file": str(steps_file) if steps_file else "",
         },
         "counts": {
-            "report_files": len(report_files),
-            "output_files": len(output_files),
-            "total_files": len(report_files) + len(output_files),
+            "report_files": len(report_found),
+            "output_files": len(output_found),
+            "total_files": len(report_found) + len(output_found),
             "steps_total": len(steps),
             "steps_failed": len(failed_steps),
             "steps_retried": len(retried_steps),
@@ -111,14 +260,23 @@ def main() -> int:
         "log": {
             "exists": log_exists,
             "size_bytes": log_size,
+            "line_count": log_line_count,
         },
         "steps": steps,
-        "reports": report_files,
-        "outputs": output_files,
     }
 
+    # Consumers like run_history_index only read counts/log; --compact skips
+    # the per-file arrays they would parse and throw away.
+    if args.compact:
+        file_arrays: list[tuple[str, Iterator[dict[str, Any]]]] = []
+    else:
+        file_arrays = [
+            ("reports", iter_records(report_found, report_dir)),
+            ("outputs", iter_records(output_found, output_dir)),
+        ]
+
     manifest_path.parent.mkdir(parents=True, exist_ok=True)
-    manifest_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    write_manifest(manifest_path, payload, file_arrays)
 
     print(
         "Run manifest written: "
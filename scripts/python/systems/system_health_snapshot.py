@@ -7,6 +7,7 @@ import argparse
 import json
 import os
 import platform
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -44,9 +45,18 @@ def main() -> int:
     try:
         import psutil  # type: ignore
 
+        # Prime the CPU counters non-blockingly, do the real work (memory and
+        # disk reads), then read the percentage over that elapsed window —
+        # no dedicated 200 ms sleep just to produce one number.
+        psutil.cpu_percent(interval=None)
+        sample_started = time.monotonic()
         vm = psutil.virtual_memory()
         du = psutil.disk_usage("/")
-        snapshot["cpu_percent"] = psutil.cpu_percent(interval=0.2)
+        elapsed = time.monotonic() - sample_started
+        if elapsed < 0.05:
+            # Too short a window gives a meaningless sample; top it up once.
+            time.sleep(0.05 - elapsed)
+        snapshot["cpu_percent"] = psutil.cpu_percent(interval=None)
         snapshot["memory"] = {
             "total_gb": bytes_to_gb(vm.total),
             "available_gb": bytes_to_gb(vm.available),